@@ -1,13 +1,32 @@
+import copy
+import hashlib
 import json
 import os
+import sys
+import tempfile
 import uuid
 from typing import Any
 
 from constants import CONFIG_PATH
+from models import Feed
+
+# normalize_feeds の結果を cfg 自体に保持するキー（config.json には書き出さない）
+_NORMALIZED_FEEDS_KEY = "_normalized_feeds"
+
+# (st_mtime_ns, st_size) of CONFIG_PATH when it was parsed, and the parsed dict
+_CACHE: tuple[tuple[int, int], dict] | None = None
+
+# 直近に save_config で書いた内容の blake2b-128 と、書いた直後の (st_mtime_ns, st_size)
+_LAST_WRITTEN: tuple[bytes, tuple[int, int]] | None = None
 
 
 def load_config() -> dict[str, Any]:
-    if not os.path.exists(CONFIG_PATH):
+    global _CACHE
+    try:
+        st = os.stat(CONFIG_PATH)
+    except FileNotFoundError:
+        st = None
+    if st is None:
         default_conf = {
             "api_key": "PUT_YOUR_API_KEY",
             "refresh_minutes": 30,
@@ -22,60 +41,128 @@ def load_config() -> dict[str, Any]:
             "enable_api_details": False,
             "search_custom_fields": "",
         }
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(default_conf, f, indent=2)
-        return default_conf
+        if _write_atomic(json.dumps(default_conf, indent=2), overwrite=False):
+            return default_conf
+        # 同時に起動した別インスタンスが先に作成した設定を読む
+        st = os.stat(CONFIG_PATH)
+    key = (st.st_mtime_ns, st.st_size)
+    if _CACHE is not None and _CACHE[0] == key:
+        return copy.deepcopy(_CACHE[1])
     with open(CONFIG_PATH, "r", encoding="utf-8") as f:
         cfg = json.load(f)
-    # 足りないフィードIDを採番して保存
-    updated_feeds = ensure_feed_ids(cfg.get("feeds"))
-    if updated_feeds is not None:
-        cfg["feeds"] = updated_feeds
+    # 足りないフィードIDを採番して保存（全件採番済みなら書き込まない）
+    _, updated = ensure_feed_ids(cfg.get("feeds"))
+    if updated:
         save_config(cfg)
-    return cfg
+    else:
+        _CACHE = (key, cfg)
+    return copy.deepcopy(cfg)
+
+
+def normalize_feeds(cfg: dict) -> list[Feed]:
+    """cfg["feeds"] を正規化したリストを返す。
+
+    結果は cfg に保持し、cfg["feeds"] が同じリストである限り再計算しない。
+    呼び出し側で変更する場合はコピーすること。
+    """
+    raw = cfg.get("feeds")
+    cached = cfg.get(_NORMALIZED_FEEDS_KEY)
+    if cached is not None and cached[0] is raw:
+        return cached[1]
+    normed = _normalize_feeds(cfg)
+    cfg[_NORMALIZED_FEEDS_KEY] = (raw, normed)
+    return normed
 
 
-def normalize_feeds(cfg: dict) -> list[dict]:
-    feeds = ensure_feed_ids(cfg.get("feeds")) or []
+def _normalize_feeds(cfg: dict) -> list[Feed]:
+    feeds, _ = ensure_feed_ids(cfg.get("feeds"))
     if isinstance(feeds, list) and feeds:
         normed = []
         for f in feeds:
             if not isinstance(f, dict):
                 continue
-            feed_id = f.get("id") or ""
-            title = f.get("title") or f.get("name") or "feed"
-            url = f.get("url") or f.get("feed_url") or ""
-            search = f.get("search", "")
-            search_custom = f.get("search_custom", "")
+            feed_id = _intern(f.get("id") or "")
+            title = _intern(f.get("title") or f.get("name") or "feed")
+            url = _intern(f.get("url") or f.get("feed_url") or "")
+            search = _intern(f.get("search", ""))
+            search_custom = _intern(f.get("search_custom", ""))
             if url:
-                normed.append({"id": feed_id, "title": title, "url": url, "search": search, "search_custom": search_custom})
+                normed.append(Feed(feed_id, title, url, search, search_custom))
         if normed:
             return normed
     # backward compatibility: single feed_url
     if cfg.get("feed_url"):
-        return [{"id": generate_feed_id(), "title": "default", "url": cfg["feed_url"], "search": ""}]
+        return [Feed(generate_feed_id(), "default", cfg["feed_url"])]
     return []
 
 
+def _intern(value: Any) -> Any:
+    # フィード設定値はチケットのキーや比較に繰り返し使われるため intern しておく
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 def save_config(cfg: dict) -> None:
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, indent=2, ensure_ascii=False)
+    global _CACHE, _LAST_WRITTEN
+    # json.dump は細切れに write するため、一括で文字列化して1回で書き込む
+    data = {k: v for k, v in cfg.items() if k != _NORMALIZED_FEEDS_KEY}
+    payload = json.dumps(data, indent=2, ensure_ascii=False)
+    digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+    try:
+        st = os.stat(CONFIG_PATH)
+        key = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        key = None
+    # 前回書いた内容と同一で、その後ファイルが外部から変更されていなければ書き込まない
+    if _LAST_WRITTEN is None or _LAST_WRITTEN != (digest, key):
+        _write_atomic(payload)
+        st = os.stat(CONFIG_PATH)
+        key = (st.st_mtime_ns, st.st_size)
+        _LAST_WRITTEN = (digest, key)
+    # 書き出した内容を読み直さずにキャッシュへ載せる。呼び出し側が後から cfg を変更しても影響しないようコピーする
+    _CACHE = (key, copy.deepcopy(data))
+
+
+def _write_atomic(payload: str, overwrite: bool = True) -> bool:
+    """一時ファイルに書いて fsync し、CONFIG_PATH と差し替える。
+
+    書き込み途中で落ちても config.json が壊れない。overwrite=False のときは
+    既存の config.json を上書きせず False を返す。
+    """
+    directory = os.path.dirname(os.path.abspath(CONFIG_PATH))
+    fd, tmp = tempfile.mkstemp(prefix=".config.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if overwrite:
+            os.replace(tmp, CONFIG_PATH)
+            return True
+        try:
+            os.link(tmp, CONFIG_PATH)
+        except FileExistsError:
+            return False
+        return True
+    finally:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
 
 
 def generate_feed_id() -> str:
     return uuid.uuid4().hex
 
 
-def ensure_feed_ids(feeds: Any) -> list[dict] | None:
+def ensure_feed_ids(feeds: Any) -> tuple[list[dict], bool]:
+    """IDのないフィードにその場で採番する。戻り値は (feeds, 採番したか)。"""
     if not isinstance(feeds, list):
-        return None
+        return [], False
+    if all(f.get("id") for f in feeds if isinstance(f, dict)):
+        return feeds, False
     updated = False
-    new_list: list[dict] = []
     for f in feeds:
-        if not isinstance(f, dict):
-            continue
-        if "id" not in f or not f.get("id"):
-            f = {**f, "id": generate_feed_id()}
+        if isinstance(f, dict) and not f.get("id"):
+            f["id"] = generate_feed_id()
             updated = True
-        new_list.append(f)
-    return new_list if updated else feeds
+    return feeds, updated
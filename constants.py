@@ -1,3 +1,11 @@
 CONFIG_PATH = "config.json"
 DATA_PATH = "tickets.csv"
+JOURNAL_PATH = "tickets.journal.csv"
+FEED_CACHE_PATH = "feed_cache.json"
 ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+ATOM_ENTRY = f"{{{ATOM_NS['atom']}}}entry"
+ATOM_TITLE = f"{{{ATOM_NS['atom']}}}title"
+ATOM_CONTENT = f"{{{ATOM_NS['atom']}}}content"
+ATOM_ID = f"{{{ATOM_NS['atom']}}}id"
+ATOM_UPDATED = f"{{{ATOM_NS['atom']}}}updated"
+ATOM_CATEGORY = f"{{{ATOM_NS['atom']}}}category"
@@ -0,0 +1,68 @@
+from PySide6.QtCore import QEvent, QModelIndex, QPersistentModelIndex, QRect, QSize, Qt, Signal
+from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton, QStyleOptionViewItem
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """チケット行の列にボタンを描画する。行ごとにQPushButtonを作らずにクリックを扱う。
+
+    チケットIDは同じ行の0列目の Qt.UserRole から取る（見出し行は対象外）。
+    """
+
+    clicked = Signal(str)
+
+    def __init__(self, text: str, parent=None) -> None:
+        super().__init__(parent)
+        self.text = text
+        self._pressed = QPersistentModelIndex()
+
+    @staticmethod
+    def _ticket_id(index: QModelIndex) -> str:
+        return index.siblingAtColumn(0).data(Qt.UserRole) or ""
+
+    @staticmethod
+    def _button_rect(option: QStyleOptionViewItem) -> QRect:
+        return option.rect.adjusted(2, 1, -2, -1)
+
+    def paint(self, painter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        if not self._ticket_id(index):
+            super().paint(painter, option, index)
+            return
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        btn = QStyleOptionButton()
+        btn.rect = self._button_rect(option)
+        btn.text = self.text
+        btn.state = QStyle.State_Enabled | (QStyle.State_Sunken if self._pressed == index else QStyle.State_Raised)
+        style.drawControl(QStyle.CE_PushButton, btn, painter, widget)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        # 見出し行も同じ高さにする（一覧は setUniformRowHeights で先頭行の高さを使う）
+        size = super().sizeHint(option, index)
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        btn = QStyleOptionButton()
+        btn.text = self.text
+        text_size = option.fontMetrics.size(Qt.TextShowMnemonic, self.text)
+        button = style.sizeFromContents(QStyle.CT_PushButton, btn, text_size, widget)
+        return size.expandedTo(button)
+
+    def editorEvent(self, event: QEvent, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        ticket_id = self._ticket_id(index)
+        if not ticket_id:
+            return super().editorEvent(event, model, option, index)
+        etype = event.type()
+        if etype not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick):
+            return False
+        if event.button() != Qt.LeftButton or not self._button_rect(option).contains(event.position().toPoint()):
+            return False
+        # ボタン上の押下は行選択やダブルクリック処理に渡さない
+        if etype == QEvent.MouseButtonPress:
+            self._pressed = QPersistentModelIndex(index)
+        elif etype == QEvent.MouseButtonRelease:
+            pressed = self._pressed == index
+            self._pressed = QPersistentModelIndex()
+            if pressed:
+                self.clicked.emit(ticket_id)
+        if option.widget is not None:
+            option.widget.update()
+        return True
@@ -1,3 +1,6 @@
+from dataclasses import asdict
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
 from PySide6.QtWidgets import (
     QCheckBox,
     QDialog,
@@ -8,26 +11,68 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QPushButton,
     QSpinBox,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QHeaderView,
     QWidget,
 )
 
-from config_manager import normalize_feeds, save_config, generate_feed_id
+from config_manager import generate_feed_id, normalize_feeds, save_config
+from models import Feed
+
+
+class FeedsModel(QAbstractTableModel):
+    """設定ダイアログのフィード一覧。渡されたリストをそのまま参照・更新する。"""
+
+    HEADERS = ("タイトル", "URL", "検索キーワード", "検索対象CF")
+    KEYS = ("title", "url", "search", "search_custom")
+
+    def __init__(self, feeds: list[Feed], parent=None) -> None:
+        super().__init__(parent)
+        self._feeds = feeds
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._feeds)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return getattr(self._feeds[index.row()], self.KEYS[index.column()])
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def append_feed(self, feed: Feed) -> None:
+        row = len(self._feeds)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._feeds.append(feed)
+        self.endInsertRows()
+
+    def replace_feed(self, row: int, feed: Feed) -> None:
+        self._feeds[row] = feed
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def remove_feed(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._feeds[row]
+        self.endRemoveRows()
 
 
 class FeedEditDialog(QDialog):
-    def __init__(self, parent=None, feed: dict | None = None) -> None:
+    def __init__(self, parent=None, feed: Feed | None = None) -> None:
         super().__init__(parent)
         self.setWindowTitle("フィード編集")
         self.resize(420, 180)
 
-        self.title_edit = QLineEdit(feed.get("title", "") if feed else "")
-        self.url_edit = QLineEdit(feed.get("url", "") if feed else "")
-        self.search_edit = QLineEdit(feed.get("search", "") if feed else "")
-        self.search_custom_edit = QLineEdit(feed.get("search_custom", "") if feed else "")
+        self.title_edit = QLineEdit(feed.title if feed else "")
+        self.url_edit = QLineEdit(feed.url if feed else "")
+        self.search_edit = QLineEdit(feed.search if feed else "")
+        self.search_custom_edit = QLineEdit(feed.search_custom if feed else "")
 
         form = QFormLayout()
         form.addRow("タイトル", self.title_edit)
@@ -50,7 +95,7 @@ class FeedEditDialog(QDialog):
         layout.addLayout(form)
         layout.addLayout(btn_box)
 
-    def get_result(self) -> dict | None:
+    def get_result(self) -> Feed | None:
         if self.exec() == QDialog.Accepted:
             title = self.title_edit.text().strip() or "feed"
             url = self.url_edit.text().strip()
@@ -59,7 +104,7 @@ class FeedEditDialog(QDialog):
             if not url:
                 QMessageBox.warning(self, "URL未入力", "URLを入力してください。")
                 return None
-            return {"title": title, "url": url, "search": search, "search_custom": search_custom}
+            return Feed("", title, url, search, search_custom)
         return None
 
 
@@ -69,7 +114,7 @@ class ConfigDialog(QDialog):
         self.setWindowTitle("設定 (config.json)")
         self.resize(700, 420)
         self.cfg = cfg
-        self.feeds: list[dict] = normalize_feeds(cfg)
+        self.feeds: list[Feed] = list(normalize_feeds(cfg))
 
         self.api_edit = QLineEdit(cfg.get("api_key", ""))
         self.refresh_spin = QSpinBox()
@@ -85,15 +130,17 @@ class ConfigDialog(QDialog):
         self.sort_by_due_chk = QCheckBox("期日でソート")
         self.sort_by_due_chk.setChecked(bool(cfg.get("sort_by_due", False)))
 
-        self.feed_table = QTableWidget(0, 4)
-        self.feed_table.setHorizontalHeaderLabels(["タイトル", "URL", "検索キーワード", "検索対象CF"])
-        self.feed_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.feed_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.feed_model = FeedsModel(self.feeds, self)
+        self.feed_table = QTableView()
+        self.feed_table.setModel(self.feed_model)
+        self.feed_table.setSelectionBehavior(QTableView.SelectRows)
+        self.feed_table.setSelectionMode(QTableView.SingleSelection)
         header = self.feed_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setStretchLastSection(True)
         self.feed_table.doubleClicked.connect(self.handle_table_double_click)
-
-        self.load_feeds_into_table()
+        # 列幅の自動調整は初回のみ。以降の追加・編集・削除ではユーザーの列幅を保つ
+        self.feed_table.resizeColumnsToContents()
 
         add_btn = QPushButton("追加")
         add_btn.clicked.connect(self.add_feed)
@@ -131,22 +178,12 @@ class ConfigDialog(QDialog):
         layout.addLayout(btns)
         layout.addLayout(bottom)
 
-    def load_feeds_into_table(self) -> None:
-        self.feed_table.setRowCount(len(self.feeds))
-        for row, f in enumerate(self.feeds):
-            self.feed_table.setItem(row, 0, QTableWidgetItem(f.get("title", "")))
-            self.feed_table.setItem(row, 1, QTableWidgetItem(f.get("url", "")))
-            self.feed_table.setItem(row, 2, QTableWidgetItem(f.get("search", "")))
-            self.feed_table.setItem(row, 3, QTableWidgetItem(f.get("search_custom", "")))
-        self.feed_table.resizeColumnsToContents()
-
     def add_feed(self) -> None:
         dlg = FeedEditDialog(self)
         res = dlg.get_result()
-        if res:
-            res["id"] = generate_feed_id()
-            self.feeds.append(res)
-            self.load_feeds_into_table()
+        if res is not None:
+            res.id = generate_feed_id()
+            self.feed_model.append_feed(res)
 
     def edit_feed(self) -> None:
         indexes = self.feed_table.selectionModel().selectedRows()
@@ -156,11 +193,10 @@ class ConfigDialog(QDialog):
         row = indexes[0].row()
         dlg = FeedEditDialog(self, self.feeds[row])
         res = dlg.get_result()
-        if res:
-            res["id"] = self.feeds[row].get("id") or generate_feed_id()
-            res["search_custom"] = res.get("search_custom") or self.feeds[row].get("search_custom", "")
-            self.feeds[row] = res
-            self.load_feeds_into_table()
+        if res is not None:
+            res.id = self.feeds[row].id or generate_feed_id()
+            res.search_custom = res.search_custom or self.feeds[row].search_custom
+            self.feed_model.replace_feed(row, res)
 
     def handle_table_double_click(self) -> None:
         self.edit_feed()
@@ -171,8 +207,7 @@ class ConfigDialog(QDialog):
             QMessageBox.information(self, "未選択", "削除するフィードを選択してください。")
             return
         row = indexes[0].row()
-        del self.feeds[row]
-        self.load_feeds_into_table()
+        self.feed_model.remove_feed(row)
 
     def save_and_close(self) -> None:
         # validate feeds
@@ -180,21 +215,23 @@ class ConfigDialog(QDialog):
             QMessageBox.warning(self, "フィードなし", "少なくとも1件のフィードを登録してください。")
             return
         for f in self.feeds:
-            if not f.get("url"):
+            if not f.url:
                 QMessageBox.warning(self, "URL未入力", "URLが未入力のフィードがあります。")
                 return
         if self.enable_api_chk.isChecked() and not self.api_edit.text().strip():
             QMessageBox.warning(self, "APIキー未入力", "「追加情報取得（API）」がオンの場合、APIキーを入力してください。")
             return
-        new_cfg = {
-            **self.cfg,  # keep other preferences such as display options
-            "api_key": self.api_edit.text().strip(),
-            "refresh_minutes": int(self.refresh_spin.value()),
-            "feeds": self.feeds,
-            "enable_api_details": bool(self.enable_api_chk.isChecked()),
-            "show_updated": bool(self.show_updated_chk.isChecked()),
-            "show_done_at": bool(self.show_done_at_chk.isChecked()),
-            "sort_by_due": bool(self.sort_by_due_chk.isChecked()),
-        }
-        save_config(new_cfg)
+        # keep other preferences such as display options by updating in place
+        self.cfg.update(
+            {
+                "api_key": self.api_edit.text().strip(),
+                "refresh_minutes": int(self.refresh_spin.value()),
+                "feeds": [asdict(f) for f in self.feeds],
+                "enable_api_details": bool(self.enable_api_chk.isChecked()),
+                "show_updated": bool(self.show_updated_chk.isChecked()),
+                "show_done_at": bool(self.show_done_at_chk.isChecked()),
+                "sort_by_due": bool(self.sort_by_due_chk.isChecked()),
+            }
+        )
+        save_config(self.cfg)
         self.accept()
@@ -1,20 +1,311 @@
+import functools
+import hashlib
+import http.client
 import json
+import os
+import re
+import sys
+import threading
 import urllib.error
+import urllib.parse
 import urllib.request
 import xml.etree.ElementTree as ET
-from typing import Iterable, Tuple
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
 
-from constants import ATOM_NS
+from constants import ATOM_CONTENT, ATOM_ENTRY, ATOM_TITLE, FEED_CACHE_PATH
 from models import Ticket
 
+# スレッド間で共有するopener（ハンドラ構築を毎回行わない）。プロキシ経由の場合に使う
+_OPENER = urllib.request.build_opener()
 
-def _split_terms(search: str | Iterable[str]) -> list[str]:
+_READ_CHUNK_SIZE = 64 * 1024
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+_MAX_REDIRECTS = 5
+# ホストごとに保持するkeep-alive接続の上限（並列取得のワーカー数程度）
+_MAX_IDLE_PER_HOST = 4
+
+# これより大きいフィードは別プロセスで解析する（GILを持ったままUIスレッドを待たせない）
+_PROCESS_PARSE_MIN_BYTES = 1024 * 1024
+_parse_pool: ProcessPoolExecutor | None = None
+_parse_pool_lock = threading.Lock()
+
+# (scheme, host, port) -> 再利用待ちのkeep-alive接続
+_idle_conns: dict[tuple[str, str, int | None], list[http.client.HTTPConnection]] = {}
+_idle_lock = threading.Lock()
+
+
+@dataclass
+class _FeedCacheEntry:
+    etag: str
+    last_modified: str
+    fingerprint: tuple  # (feed_id, feed_title, feed_search, feed_search_custom)
+    digest: bytes  # 本文の blake2b-128
+
+
+# feed_url -> 前回取得時の検証子（FEED_CACHE_PATH に保存して再起動後も使う）
+_feed_http_cache: dict[str, _FeedCacheEntry] = {}
+_feed_cache_dirty = False
+# 取得済みでまだ tickets.csv に書き出していないフィードの検証子（commit_feed_validators で反映する）
+_pending_validators: dict[str, _FeedCacheEntry] = {}
+_pending_lock = threading.Lock()
+
+
+def load_feed_cache(path: str = FEED_CACHE_PATH) -> None:
+    """保存済みの検証子を読み込む。読めなければ何もしない（次回は全件取得になる）。"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entries = {
+            url: _FeedCacheEntry(
+                v.get("etag", ""),
+                v.get("last_modified", ""),
+                tuple(v["fingerprint"]),
+                bytes.fromhex(v["digest"]),
+            )
+            for url, v in data.items()
+        }
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return
+    _feed_http_cache.update(entries)
+
+
+def save_feed_cache(path: str = FEED_CACHE_PATH) -> None:
+    """前回保存以降に検証子が変わっていれば書き出す。"""
+    global _feed_cache_dirty
+    if not _feed_cache_dirty:
+        return
+    data = {
+        url: {
+            "etag": e.etag,
+            "last_modified": e.last_modified,
+            "fingerprint": list(e.fingerprint),
+            "digest": e.digest.hex(),
+        }
+        for url, e in list(_feed_http_cache.items())
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    _feed_cache_dirty = False
+
+
+def take_feed_validators() -> dict[str, _FeedCacheEntry]:
+    """今回の取得で得た検証子を取り出す（取り出した分は保留から外れる）。"""
+    with _pending_lock:
+        entries = dict(_pending_validators)
+        _pending_validators.clear()
+    return entries
+
+
+def commit_feed_validators(entries: dict[str, _FeedCacheEntry]) -> None:
+    """取り出した検証子を次回以降の取得と save_feed_cache に反映する。
+
+    チケットを tickets.csv に書き出してから呼ぶこと。先に保存すると、書き出す前に落ちたとき
+    次回の取得が「変化なし」になり、取得済みのチケットが失われる。
+    """
+    global _feed_cache_dirty
+    if not entries:
+        return
+    _feed_http_cache.update(entries)
+    _feed_cache_dirty = True
+
+
+def _checkout_conn(key: tuple[str, str, int | None], timeout: int) -> tuple[http.client.HTTPConnection, bool]:
+    with _idle_lock:
+        idle = _idle_conns.get(key)
+        conn = idle.pop() if idle else None
+    if conn is not None:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+    scheme, host, port = key
+    conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    return conn_cls(host, port, timeout=timeout), False
+
+
+def _checkin_conn(key: tuple[str, str, int | None], conn: http.client.HTTPConnection) -> None:
+    with _idle_lock:
+        idle = _idle_conns.setdefault(key, [])
+        if len(idle) < _MAX_IDLE_PER_HOST:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+class _GzipResponse:
+    """Content-Encoding: gzip の本文を読みながら展開するレスポンスのラッパー。"""
+
+    def __init__(self, resp) -> None:
+        self._resp = resp
+        self.headers = resp.headers
+        # 32 + MAX_WBITS: gzip / zlib ヘッダーを自動判別
+        self._decomp = zlib.decompressobj(32 + zlib.MAX_WBITS)
+
+    def read(self, amt: int = -1) -> bytes:
+        if amt is None or amt < 0:
+            return self._decomp.decompress(self._resp.read()) + self._decomp.flush()
+        # 展開結果が空のチャンクで読み終わりと誤認させないよう、出力が得られるまで読む
+        while True:
+            raw = self._resp.read(amt)
+            if not raw:
+                return self._decomp.flush()
+            out = self._decomp.decompress(raw)
+            if out:
+                return out
+
+
+def _decoded(resp):
+    if resp.headers.get("Content-Encoding", "").strip().lower() == "gzip":
+        return _GzipResponse(resp)
+    return resp
+
+
+@contextmanager
+def _open(url: str, headers: dict[str, str], timeout: int, _redirects: int = 0) -> Iterator:
+    """GETしてレスポンスを返す。同一ホストへの接続はkeep-aliveで使い回す。
+
+    2xx以外は urllib と同じく urllib.error.HTTPError を送出する。
+    本文は gzip で受け取り、読み出し時に展開する。
+    """
+    if "Accept-Encoding" not in headers:
+        headers = {**headers, "Accept-Encoding": "gzip"}
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https") or (
+        parts.scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(parts.hostname or "")
+    ):
+        with _OPENER.open(urllib.request.Request(url, headers=headers), timeout=timeout) as resp:
+            yield _decoded(resp)
+        return
+
+    key = (parts.scheme, parts.hostname or "", parts.port)
+    path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+    conn, reused = _checkout_conn(key, timeout)
+    try:
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+    except ConnectionError:
+        # サーバー側で閉じられたkeep-alive接続なら張り直して1回だけ再送する
+        conn.close()
+        if not reused:
+            raise
+        conn, _ = _checkout_conn(key, timeout)
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+        except BaseException:
+            conn.close()
+            raise
+    except BaseException:
+        conn.close()
+        raise
+
+    try:
+        if resp.status in _REDIRECT_CODES and resp.getheader("Location") and _redirects < _MAX_REDIRECTS:
+            resp.read()
+            location = urllib.parse.urljoin(url, resp.getheader("Location"))
+            with _open(location, headers, timeout, _redirects + 1) as redirected:
+                yield redirected
+            return
+        if not 200 <= resp.status < 300:
+            resp.read()
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        yield _decoded(resp)
+    finally:
+        # 本文を読み切っていてサーバーが閉じない場合のみプールへ戻す
+        if resp.isclosed() and not resp.will_close:
+            _checkin_conn(key, conn)
+        else:
+            conn.close()
+
+
+def _split_terms(search: str | Iterable[str]) -> tuple[str, ...]:
     if not search:
-        return []
+        return ()
+    if not isinstance(search, str):
+        search = tuple(str(w) for w in search)
+    return _split_terms_cached(search)
+
+
+@functools.lru_cache(maxsize=256)
+def _split_terms_cached(search: str | tuple[str, ...]) -> tuple[str, ...]:
+    # 設定文字列は同期のたびに同じものが渡されるため、分割結果を使い回す
     if isinstance(search, str):
         parts = [p.strip() for p in search.split(",")]
-        return [w.lower() for w in parts if w]
-    return [str(w).strip().lower() for w in search if str(w).strip()]
+        return tuple(sys.intern(w.lower()) for w in parts if w)
+    return tuple(sys.intern(w.strip().lower()) for w in search if w.strip())
+
+
+def _compile_terms(search: str | Iterable[str]) -> re.Pattern[str] | None:
+    """検索語をOR条件の正規表現1本にまとめる。検索語がなければNone。"""
+    terms = _split_terms(search)
+    if not terms:
+        return None
+    return _compile_pattern(terms)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(terms: tuple[str, ...]) -> re.Pattern[str]:
+    return re.compile("|".join(map(re.escape, terms)), re.IGNORECASE)
+
+
+def _collect_entries(
+    parser: ET.XMLPullParser,
+    root: ET.Element | None,
+    tickets: list[Ticket],
+    pattern: re.Pattern[str] | None,
+    feed_id: str,
+    feed_title: str,
+    feed_search: str | list[str],
+) -> ET.Element | None:
+    """読み終えたentryをチケット化する。戻り値はルート要素（次回呼び出しに渡す）。"""
+    for event, elem in parser.read_events():
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        if elem.tag != ATOM_ENTRY:
+            continue
+        search_hit = False
+        if pattern is not None:
+            title_text = ""
+            content_text = ""
+            for child in elem:
+                if child.tag == ATOM_TITLE:
+                    title_text = child.text or ""
+                elif child.tag == ATOM_CONTENT:
+                    content_text = child.text or ""
+            search_hit = bool(pattern.search(title_text) or pattern.search(content_text))
+        tickets.append(Ticket.from_entry(elem, feed_id, feed_title, feed_search, search_hit))
+        elem.clear()
+        # 処理済みのentryをルートから外し、空要素が溜まらないようにする
+        if root is not None and len(root) and root[-1] is elem:
+            del root[-1]
+    return root
+
+
+def _parse_feed_bytes(data: bytes, feed_id: str, feed_title: str, feed_search: str | list[str]) -> list[Ticket]:
+    """フィード本文を解析する。大きいフィードでは解析用プロセスで実行される。"""
+    tickets: list[Ticket] = []
+    pattern = _compile_terms(feed_search)
+    parser = ET.XMLPullParser(events=("start", "end"))
+    parser.feed(data)
+    parser.close()
+    _collect_entries(parser, None, tickets, pattern, feed_id, feed_title, feed_search)
+    return tickets
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=1)
+        return _parse_pool
 
 
 def fetch_feed(
@@ -23,35 +314,82 @@ def fetch_feed(
     feed_id: str,
     feed_title: str,
     feed_search: str | list[str],
+    feed_search_custom: str = "",
     timeout: int = 15,
-) -> list[Ticket]:
-    req = urllib.request.Request(feed_url)
-    req.add_header("X-Redmine-API-Key", api_key)
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        data = resp.read()
-    root = ET.fromstring(data)
+) -> list[Ticket] | None:
+    """フィードを取得してチケット化する。前回取得時から変化がなければ None を返す。
+
+    新しい検証子は保留に置かれ、take_feed_validators / commit_feed_validators で反映する。
+    feed_search_custom はチケットに反映しないが、変わったときは取得し直してマージさせるため検証子の照合に含める。
+    """
+    headers = {"X-Redmine-API-Key": api_key}
+    fingerprint = (feed_id, feed_title, feed_search, feed_search_custom)
+    cached = _feed_http_cache.get(feed_url)
+    if cached is not None and cached.fingerprint == fingerprint:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    else:
+        cached = None
+    pattern = _compile_terms(feed_search)
     tickets: list[Ticket] = []
-    terms = _split_terms(feed_search)
-    for entry in root.findall("atom:entry", ATOM_NS):
-        search_hit = False
-        if terms:
-            title_text = (entry.findtext("atom:title", default="", namespaces=ATOM_NS) or "").lower()
-            content_text = (entry.findtext("atom:content", default="", namespaces=ATOM_NS) or "").lower()
-            search_hit = any(term in title_text or term in content_text for term in terms)
-        t = Ticket.from_entry(entry, feed_id, feed_title, feed_search, search_hit)
-        tickets.append(t)
+    hasher = hashlib.blake2b(digest_size=16)
+    # 受信しながらパースし、entryが閉じた時点でチケット化して解放する
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    data: bytes | None = None
+    try:
+        with _open(feed_url, headers, timeout) as resp:
+            etag = resp.headers.get("ETag", "")
+            last_modified = resp.headers.get("Last-Modified", "")
+            # 別プロセスで解析するかは展開後のサイズで決める。Content-Length（gzip なら圧縮後）が
+            # 閾値以上なら展開後も必ず超えるので最初からまとめて読む
+            length = resp.headers.get("Content-Length", "")
+            if length.isdigit() and int(length) >= _PROCESS_PARSE_MIN_BYTES:
+                data = resp.read()
+                hasher.update(data)
+            else:
+                # chunked や gzip では大きさが分からないため、閾値に達するまでは受信しながら解析する
+                received: list[bytes] = []
+                size = 0
+                while chunk := resp.read(_READ_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    received.append(chunk)
+                    size += len(chunk)
+                    if size >= _PROCESS_PARSE_MIN_BYTES:
+                        # 途中までの解析結果は捨て、残りを読み切って別プロセスで解析する
+                        rest = resp.read()
+                        hasher.update(rest)
+                        received.append(rest)
+                        data = b"".join(received)
+                        break
+                    parser.feed(chunk)
+                    root = _collect_entries(parser, root, tickets, pattern, feed_id, feed_title, feed_search)
+    except urllib.error.HTTPError as e:
+        # 304 Not Modified: 本文なし、解析も不要
+        if e.code == 304 and cached is not None:
+            return None
+        raise
+    if data is None:
+        parser.close()
+        _collect_entries(parser, root, tickets, pattern, feed_id, feed_title, feed_search)
+    digest = hasher.digest()
+    if cached is not None and cached.digest == digest:
+        # 検証子がなくても本文が前回と同一なら変化なしとして扱う
+        return None
+    if data is not None:
+        tickets = _get_parse_pool().submit(_parse_feed_bytes, data, feed_id, feed_title, feed_search).result()
+    with _pending_lock:
+        _pending_validators[feed_url] = _FeedCacheEntry(etag, last_modified, fingerprint, digest)
     return tickets
 
 
-def fetch_issue_details(issue_url: str, api_key: str, timeout: int = 15) -> dict:
-    """Redmine REST APIから期日・説明・カスタムフィールドを取得する。"""
-    detail_url = issue_url.rstrip("/") + ".json?include=journals"
-    req = urllib.request.Request(detail_url)
-    req.add_header("X-Redmine-API-Key", api_key)
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        data = resp.read()
-    payload = json.loads(data.decode("utf-8"))
-    issue = payload.get("issue", {})
+_ISSUE_URL_RE = re.compile(r"^(.*)/issues/(\d+)/?$")
+_ISSUES_BATCH_SIZE = 100
+
+
+def _parse_issue(issue: dict) -> dict:
     due_date = issue.get("due_date") or ""
     custom_fields_map = {}
     for cf in issue.get("custom_fields", []):
@@ -63,3 +401,71 @@ def fetch_issue_details(issue_url: str, api_key: str, timeout: int = 15) -> dict
             due_date = value or ""
     description = issue.get("description") or ""
     return {"due_date": due_date, "description": description, "custom_fields": custom_fields_map}
+
+
+def fetch_issue_details(issue_url: str, api_key: str, timeout: int = 15) -> dict:
+    """Redmine REST APIから期日・説明・カスタムフィールドを取得する。"""
+    detail_url = issue_url.rstrip("/") + ".json?include=journals"
+    with _open(detail_url, {"X-Redmine-API-Key": api_key}, timeout) as resp:
+        data = resp.read()
+    payload = json.loads(data)
+    return _parse_issue(payload.get("issue", {}))
+
+
+def _fetch_issue_single(issue_url: str, api_key: str, timeout: int) -> dict[str, dict]:
+    return {issue_url: fetch_issue_details(issue_url, api_key, timeout)}
+
+
+def _fetch_issues_batch(base: str, url_by_id: dict[str, str], ids: list[str], api_key: str, timeout: int) -> dict[str, dict]:
+    query = urllib.parse.urlencode({"issue_id": ",".join(ids), "status_id": "*", "limit": _ISSUES_BATCH_SIZE}, safe=",*")
+    with _open(f"{base}/issues.json?{query}", {"X-Redmine-API-Key": api_key}, timeout) as resp:
+        data = resp.read()
+    payload = json.loads(data)
+    results: dict[str, dict] = {}
+    for issue in payload.get("issues", []):
+        url = url_by_id.get(str(issue.get("id")))
+        if url:
+            results[url] = _parse_issue(issue)
+    return results
+
+
+def _run_details_job(job: Callable[[], dict[str, dict]]) -> dict[str, dict]:
+    # 1件・1バッチの失敗（権限のないプロジェクト、404など）で他の結果を捨てない
+    try:
+        return job()
+    except Exception:  # noqa: BLE001
+        return {}
+
+
+def fetch_issues_details(issue_urls: Iterable[str], api_key: str, timeout: int = 15) -> dict[str, dict]:
+    """複数チケットの追加情報を issues.json の issue_id 指定でまとめて取得する。
+
+    戻り値はチケットURL -> fetch_issue_details と同じ形式のdict。
+    /issues/<id> 形式でないURLは1件ずつ取得する。リクエストが複数になる場合は並列に送る。
+    取得に失敗したリクエストの分は結果に含めない。
+    """
+    by_base: dict[str, dict[str, str]] = {}
+    single_urls: list[str] = []
+    for url in issue_urls:
+        match = _ISSUE_URL_RE.match(url)
+        if match:
+            by_base.setdefault(match.group(1), {})[match.group(2)] = url
+        else:
+            single_urls.append(url)
+    jobs = [functools.partial(_fetch_issue_single, url, api_key, timeout) for url in single_urls]
+    for base, url_by_id in by_base.items():
+        ids = list(url_by_id)
+        for i in range(0, len(ids), _ISSUES_BATCH_SIZE):
+            jobs.append(
+                functools.partial(_fetch_issues_batch, base, url_by_id, ids[i : i + _ISSUES_BATCH_SIZE], api_key, timeout)
+            )
+    if len(jobs) <= 1:
+        outputs = [_run_details_job(job) for job in jobs]
+    else:
+        # 待ち時間は通信なので、keep-alive接続を使い回しつつ並列に投げる
+        with ThreadPoolExecutor(max_workers=min(_MAX_IDLE_PER_HOST, len(jobs))) as ex:
+            outputs = list(ex.map(_run_details_job, jobs))
+    results: dict[str, dict] = {}
+    for output in outputs:
+        results.update(output)
+    return results
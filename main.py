@@ -1,9 +1,14 @@
-from PySide6.QtWidgets import QApplication
+def main() -> None:
+    # 大きいフィードの解析に子プロセスを使うため、PyInstaller の onefile ビルドでも動くようにする
+    import multiprocessing
 
-from main_window import MainWindow
+    multiprocessing.freeze_support()
 
+    # Qt とUI一式の読み込みは起動時にのみ行う（import main だけでは読み込まない）
+    from PySide6.QtWidgets import QApplication
+
+    from main_window import MainWindow
 
-def main() -> None:
     app = QApplication([])
     window = MainWindow()
     window.resize(960, 640)
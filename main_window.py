@@ -1,9 +1,12 @@
+import bisect
+import operator
+import os
 import urllib.error
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
 
-from PySide6.QtCore import QTimer, Qt, QUrl
+from PySide6.QtCore import QEvent, QModelIndex, QThreadPool, QTimer, Qt, QUrl
 from PySide6.QtGui import QDesktopServices, QIcon
 from PySide6.QtWidgets import (
     QApplication,
@@ -17,18 +20,36 @@ from PySide6.QtWidgets import (
     QPushButton,
     QStyle,
     QSystemTrayIcon,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTreeView,
     QVBoxLayout,
     QWidget,
 )
 
 from config_manager import load_config, normalize_feeds, save_config
-from dialogs import ConfigDialog
-from feed_client import _split_terms, fetch_feed, fetch_issue_details
-from models import Ticket
-from storage import load_csv, save_csv
+from constants import JOURNAL_PATH
+from delegates import ButtonDelegate
+from feed_client import (
+    _compile_terms,
+    _split_terms,
+    commit_feed_validators,
+    load_feed_cache,
+    save_feed_cache,
+    take_feed_validators,
+)
+from models import Feed, Ticket
+from storage import append_journal, clear_journal, journal_generation, load_csv, save_csv, ticket_rows
+from ticket_model import TicketTreeModel
 from ui_columns import COLUMNS
+from workers import CsvWriter, DetailsFetchWorker, FeedFetchWorker
+
+
+# フィード内はチケット番号の数値順（数字でないIDは先頭にまとめて文字列順）
+_FEED_ORDER_KEY = operator.attrgetter("feed_id", "_id_int", "ticket_id")
+
+
+def _due_order_key(t: Ticket) -> tuple:
+    due_key = t.due_date or "9999-99-99T99:99:99"
+    return (due_key, t.feed_id, t._id_int, t.ticket_id)
 
 
 class MainWindow(QMainWindow):
@@ -38,17 +59,52 @@ class MainWindow(QMainWindow):
 
         self.config = load_config()
         self.tickets: dict[str, Ticket] = load_csv()
+        # 304 で省略したフィードのチケットは tickets.csv にあるものを使うため、CSVがあるときだけ検証子を使う
+        if self.tickets:
+            load_feed_cache()
 
         self.sync_running = False
         self.next_sync_at: datetime | None = None
 
+        # 取得中のフィード（ワーカーとシグナルを完了まで保持する）
+        self._fetch_workers: dict[int, FeedFetchWorker] = {}
+        self._sync_api_key = ""
+        self._sync_totals = [0, 0, 0]
+        self._sync_detail_targets: set[str] = set()
+        self._sync_merged = False
+        self._sync_error: Exception | None = None
+        # 追加情報の取得中のワーカーと、取得・反映後に呼ぶ処理
+        self._details_worker: DetailsFetchWorker | None = None
+        self._details_on_done: Callable[[], None] | None = None
+
+        # 同期は非同期に終わるため単発にし、次回は _complete_sync が schedule_sync で予約する
         self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
         self.sync_timer.timeout.connect(self.sync_now)
 
+        # 残り時間の表示が変わる瞬間だけ起こす単発タイマー（update_remaining が次回を予約する）
         self.countdown_timer = QTimer(self)
-        self.countdown_timer.setInterval(1000)
+        self.countdown_timer.setSingleShot(True)
         self.countdown_timer.timeout.connect(self.update_remaining)
 
+        # フィードごとのマージや連続した済切替の再描画を1回にまとめる
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(50)
+        self.refresh_timer.timeout.connect(self.refresh_table)
+
+        # 済切替は tickets.journal.csv へ追記し、tickets.csv への反映は同期時・終了時にまとめて行う
+        self._journal_pending = os.path.exists(JOURNAL_PATH)
+        # tickets.csv の書き出しはUIスレッドを止めないよう専用スレッドで行う
+        self.csv_writer = CsvWriter(self)
+        # 取得済みで tickets.csv への書き出しが済んでいないフィードの検証子。書き出し後に feed_cache.json へ保存する
+        self._unsaved_validators: dict = {}
+        # 書き出しを依頼してまだ完了していない最新の依頼（完了・失敗で None に戻す）
+        self._save_token: tuple[int, dict] | None = None
+        self.csv_writer.saved.connect(self._on_csv_saved)
+        self.csv_writer.failed.connect(self._on_csv_failed)
+        self.csv_writer.start()
+
         self.tray: QSystemTrayIcon | None = None
         self.logo_icon = self._load_logo_icon()
         if self.logo_icon:
@@ -77,22 +133,34 @@ class MainWindow(QMainWindow):
         self.toggle_done_btn = QPushButton("選択一括済/未済切替")
         self.toggle_done_btn.clicked.connect(self.toggle_selected)
 
-        self.tree = QTreeWidget()
-        self.tree.setColumnCount(len(COLUMNS.labels))
-        self.tree.setHeaderLabels(list(COLUMNS.labels))
+        # 一覧はモデルから表示範囲のセルだけを描画する（行ごとのアイテムは作らない）
+        self.ticket_model = TicketTreeModel(self)
+        self.tree = QTreeView()
+        self.tree.setModel(self.ticket_model)
         header = self.tree.header()
         header.setStretchLastSection(False)
         header.setSectionResizeMode(QHeaderView.Fixed)
         for idx, w in enumerate(COLUMNS.widths):
             header.resizeSection(idx, w)
-        self.tree.setSelectionMode(QTreeWidget.MultiSelection)
-        self.tree.setSelectionBehavior(QTreeWidget.SelectRows)
-        self.tree.itemDoubleClicked.connect(self.handle_item_double_clicked)
+        self.tree.setSelectionMode(QTreeView.MultiSelection)
+        self.tree.setSelectionBehavior(QTreeView.SelectRows)
+        # 行の高さは全行同じ（ボタン列の高さ）なので、行ごとの高さ計算を省く
+        self.tree.setUniformRowHeights(True)
+        self.tree.doubleClicked.connect(self.handle_index_double_clicked)
+        # 開く・済切替ボタンは行ごとのウィジェットではなくデリゲートで描画する
+        self.open_delegate = ButtonDelegate("開く", self.tree)
+        self.open_delegate.clicked.connect(self.open_ticket)
+        self.tree.setItemDelegateForColumn(COLUMNS.IDX_OPEN, self.open_delegate)
+        self.toggle_delegate = ButtonDelegate("済切替", self.tree)
+        self.toggle_delegate.clicked.connect(self.toggle_done_one)
+        self.tree.setItemDelegateForColumn(COLUMNS.IDX_TOGGLE, self.toggle_delegate)
+        # self.tickets をソートした結果（None なら次の refresh_table で作り直す）
+        self._sorted_tickets: list[Ticket] | None = None
+        self._sorted_by_due = False
 
         self.build_ui()
         self.apply_config_settings()
         self.init_tray()
-        self.update_column_visibility()
         QTimer.singleShot(0, self.start_sync)
 
     def build_ui(self) -> None:
@@ -132,16 +200,14 @@ class MainWindow(QMainWindow):
         self.tray.setToolTip("Redmine チケット済管理")
         self.tray.show()
 
-    def reload_config(self, show_message: bool = True) -> None:
-        self.config = load_config()
-        self.apply_config_settings()
-        if show_message:
-            QMessageBox.information(self, "設定再読込", "config.json を再読込しました。")
-
     def open_config_dialog(self) -> None:
+        # 設定ダイアログは開かれるまで読み込まない
+        from dialogs import ConfigDialog
+
         dlg = ConfigDialog(self.config, self)
         if dlg.exec() == QDialog.Accepted:
-            self.reload_config(show_message=False)
+            # ダイアログは self.config を直接更新して保存するため、config.json を読み直さない
+            self.apply_config_settings()
             QMessageBox.information(self, "設定保存", "config.json を保存しました。")
 
     def open_help(self) -> None:
@@ -166,7 +232,6 @@ class MainWindow(QMainWindow):
         self.start_btn.setText("同期停止")
         self.status_label.setText("同期中")
         self.schedule_sync(0)
-        self.countdown_timer.start()
 
     def stop_sync(self) -> None:
         self.sync_running = False
@@ -180,30 +245,113 @@ class MainWindow(QMainWindow):
         self.sync_timer.stop()
         self.sync_timer.start(delay_ms)
         self.next_sync_at = datetime.now() + timedelta(milliseconds=delay_ms)
+        self.update_remaining()
 
     def update_remaining(self) -> None:
         if not self.sync_running or not self.next_sync_at:
             self.remaining_label.setText("-")
             return
-        remaining = self.next_sync_at - datetime.now()
-        if remaining.total_seconds() <= 0:
+        remaining_ms = int((self.next_sync_at - datetime.now()).total_seconds() * 1000)
+        if remaining_ms <= 0:
+            # 同期が終われば schedule_sync から再開する
             self.remaining_label.setText("同期中…")
-        else:
-            minutes, seconds = divmod(int(remaining.total_seconds()), 60)
-            self.remaining_label.setText(f"{minutes:02d}:{seconds:02d}")
+            return
+        minutes, seconds = divmod(remaining_ms // 1000, 60)
+        self.remaining_label.setText(f"{minutes:02d}:{seconds:02d}")
+        # 非表示・最小化中は起こさない（showEvent / changeEvent で再開する）
+        if self.isVisible() and not self.isMinimized():
+            self.countdown_timer.start(remaining_ms % 1000 + 1)
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.update_remaining()
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        self.countdown_timer.stop()
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.countdown_timer.stop()
+            else:
+                self.update_remaining()
 
     def sync_now(self) -> None:
+        if self._fetch_workers or self._details_worker is not None:
+            return
         api_key = self.config.get("api_key", "")
-        refresh_minutes = int(self.config.get("refresh_minutes", 30))
         feeds = normalize_feeds(self.config)
         self.status_label.setText("同期中…")
         if not feeds:
             QMessageBox.warning(self, "URL未設定", "config.json の feeds に URL を設定してください。")
             self.status_label.setText("同期失敗")
+            if self.sync_running:
+                self.schedule_sync(max(int(self.config.get("refresh_minutes", 30)), 1) * 60 * 1000)
             return
+        self._sync_api_key = api_key
+        self._sync_totals = [0, 0, 0]  # 取得件数, 新規, 更新
+        self._sync_detail_targets = set()
+        self._sync_merged = False
+        self._sync_error = None
+        # 取得はフィードごとにスレッドプールで並列に行い、マージと画面更新はこのスレッドで行う
+        pool = QThreadPool.globalInstance()
+        for feed in feeds:
+            worker = FeedFetchWorker(feed, api_key)
+            worker.signals.fetched.connect(self._on_feed_fetched)
+            worker.signals.failed.connect(self._on_feed_failed)
+            self._fetch_workers[id(feed)] = worker
+        for worker in list(self._fetch_workers.values()):
+            pool.start(worker)
+
+    def _on_feed_fetched(self, feed: Feed, fetched: list[Ticket] | None) -> None:
+        if fetched is None:
+            # 前回から変化なし。マージも保存も不要
+            self._sync_totals[0] += sum(1 for t in self.tickets.values() if t.feed_id == feed.id)
+        else:
+            new_cnt, updated_cnt, targets, changed = self.merge_tickets(fetched, feed.search_custom)
+            self._sync_totals[0] += len(fetched)
+            self._sync_totals[1] += new_cnt
+            self._sync_totals[2] += updated_cnt
+            self._sync_detail_targets.update(targets)
+            # 内容が変わらなければ tickets.csv の書き直しも再描画も不要
+            if changed:
+                self._sync_merged = True
+                self.schedule_refresh()
+        self._feed_done(feed)
+
+    def _on_feed_failed(self, feed: Feed, error: Exception) -> None:
+        if self._sync_error is None:
+            self._sync_error = error
+        self._feed_done(feed)
+
+    def _feed_done(self, feed: Feed) -> None:
+        self._fetch_workers.pop(id(feed), None)
+        if not self._fetch_workers:
+            self._finish_sync()
+
+    def _finish_sync(self) -> None:
+        if self._sync_error is None and self.config.get("enable_api_details", False) and self._sync_detail_targets:
+            # 追加情報はワーカーで取得し、反映してから同期を締める
+            if self._start_details(self._sync_detail_targets, self._sync_api_key, self._complete_sync):
+                return
+        self._complete_sync()
+
+    def _complete_sync(self) -> None:
         try:
-            total_fetched, total_new, total_updated = self._sync_feeds(feeds, api_key)
-            save_csv(self.tickets)
+            # 一部のフィードが失敗しても、取り込めた分は保存する
+            self._unsaved_validators.update(take_feed_validators())
+            # 書き出し中の依頼があると、それが終わるまで tickets.csv は今のチケットと一致しないため書き直す
+            saving = self._save_token is not None
+            if self._sync_merged or self._journal_pending or (self._unsaved_validators and saving):
+                self.flush_save()
+            elif self._unsaved_validators:
+                # チケットに変化がなければ tickets.csv は書き出し済みの内容のままでよい
+                self._commit_validators(dict(self._unsaved_validators))
+            if self._sync_error is not None:
+                raise self._sync_error
+            total_fetched, total_new, total_updated = self._sync_totals
             self.status_label.setText(f"同期完了: {total_fetched}件")
             if self.tray and (total_new or total_updated):
                 self.notify_change(total_new, total_updated)
@@ -215,94 +363,113 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "同期失敗", str(e))
         finally:
             if self.sync_running:
-                delay_ms = max(refresh_minutes, 1) * 60 * 1000
-                self.schedule_sync(delay_ms)
-
-    def _sync_feeds(self, feeds: list[dict], api_key: str) -> tuple[int, int, int]:
-        total_fetched = 0
-        total_new = 0
-        total_updated = 0
-        detail_targets: set[str] = set()
-        for feed in feeds:
-            f_id = feed.get("id", "")
-            f_title = feed.get("title", "feed")
-            f_url = feed.get("url") or feed.get("feed_url")
-            f_search = feed.get("search", "")
-            f_search_custom = feed.get("search_custom", "")
-            if not f_url:
-                continue
-            fetched = fetch_feed(f_url, api_key, f_id, f_title, f_search)
-            total_fetched += len(fetched)
-            new_cnt, updated_cnt, targets = self.merge_tickets(fetched, f_search_custom)
-            total_new += new_cnt
-            total_updated += updated_cnt
-            detail_targets.update(targets)
-
-        if self.config.get("enable_api_details", False) and detail_targets:
-            self._update_details(detail_targets, api_key)
+                refresh_minutes = int(self.config.get("refresh_minutes", 30))
+                self.schedule_sync(max(refresh_minutes, 1) * 60 * 1000)
 
-        return total_fetched, total_new, total_updated
+    def merge_tickets(self, fetched: list[Ticket], feed_search_custom: str) -> tuple[int, int, set[str], set[str]]:
+        """取得したチケットを self.tickets に反映する。
 
-    def merge_tickets(self, fetched: list[Ticket], feed_search_custom: str) -> tuple[int, int, set[str]]:
+        戻り値は (新規件数, 更新件数, 追加情報の取得対象ID, 内容が変わったID)。
+        """
         existing = self.tickets
-        new_cnt = 0
+        fetched_by_id = {t.ticket_id: t for t in fetched}
+        new_ids = fetched_by_id.keys() - existing.keys()
+        detail_targets: set[str] = set(new_ids)
+        changed: set[str] = set(new_ids)
         updated_cnt = 0
-        detail_targets: set[str] = set()
-        for t in fetched:
-            if t.ticket_id in existing:
-                done = existing[t.ticket_id].done
-                done_at = existing[t.ticket_id].done_at
-                prev = existing[t.ticket_id]
-                existing[t.ticket_id] = Ticket(
-                    ticket_id=t.ticket_id,
-                    subject=t.subject,
-                    status=t.status,
-                    updated_on=t.updated_on,
-                    url=t.url or prev.url,
-                    feed_id=t.feed_id or prev.feed_id,
-                    feed_title=t.feed_title or prev.feed_title,
-                    feed_search=t.feed_search or prev.feed_search,
-                    feed_search_custom=feed_search_custom or prev.feed_search_custom,
-                    search_hit=t.search_hit,
-                    due_date=prev.due_date,
-                    description=prev.description,
-                    custom_fields=prev.custom_fields,
-                    done=done,
-                    done_at=done_at,
-                )
-                if t.updated_on != prev.updated_on:
-                    updated_cnt += 1
-                    detail_targets.add(t.ticket_id)
+        moved = False
+        # 既存チケットはその場で更新し、済状態・追加情報はそのまま残す
+        for ticket_id in fetched_by_id.keys() & existing.keys():
+            t = fetched_by_id[ticket_id]
+            cur = existing[ticket_id]
+            url = t.url or cur.url
+            feed_id = t.feed_id or cur.feed_id
+            feed_title = t.feed_title or cur.feed_title
+            feed_search = t.feed_search or cur.feed_search
+            search_custom = feed_search_custom or cur.feed_search_custom
+            if (
+                t.updated_on == cur.updated_on
+                and t.status == cur.status
+                and t.subject == cur.subject
+                and t.search_hit == cur.search_hit
+                and url == cur.url
+                and feed_id == cur.feed_id
+                and feed_title == cur.feed_title
+                and feed_search == cur.feed_search
+                and search_custom == cur.feed_search_custom
+            ):
+                continue
+            if t.updated_on != cur.updated_on:
+                updated_cnt += 1
+                detail_targets.add(ticket_id)
+                cur.updated_on = t.updated_on
+            cur.subject = t.subject
+            cur.status = t.status
+            cur.url = url
+            moved = moved or feed_id != cur.feed_id
+            cur.feed_id = feed_id
+            cur.feed_title = feed_title
+            cur.feed_search = feed_search
+            cur.feed_search_custom = search_custom
+            cur.search_hit = t.search_hit
+            changed.add(ticket_id)
+        added = {ticket_id: t for ticket_id, t in fetched_by_id.items() if ticket_id in new_ids}
+        for t in added.values():
+            t.feed_search_custom = feed_search_custom
+        existing.update(added)
+        # 並び順は新規チケットを挿入するだけで保てる。フィードが変わったチケットがあれば並べ直す
+        sorted_tickets = self._sorted_tickets
+        if sorted_tickets is not None:
+            if moved or len(added) > len(sorted_tickets):
+                self._sorted_tickets = None
             else:
-                t.feed_search_custom = feed_search_custom
-                existing[t.ticket_id] = t
-                new_cnt += 1
-                detail_targets.add(t.ticket_id)
-        self.refresh_table()
-        return new_cnt, updated_cnt, detail_targets
-
-    def _update_details(self, ticket_ids: Iterable[str], api_key: str) -> None:
-        for tid in ticket_ids:
-            t = self.tickets.get(tid)
-            if not t or not t.url:
+                key = _due_order_key if self._sorted_by_due else _FEED_ORDER_KEY
+                for t in added.values():
+                    bisect.insort(sorted_tickets, t, key=key)
+        return len(new_ids), updated_cnt, detail_targets, changed
+
+    def _start_details(self, ticket_ids: Iterable[str], api_key: str, on_done: Callable[[], None]) -> bool:
+        """追加情報の取得をワーカーで始める。対象がなければ何もせず False を返す。"""
+        targets = [t for t in (self.tickets.get(tid) for tid in ticket_ids) if t and t.url]
+        if not targets:
+            return False
+        worker = DetailsFetchWorker(targets, api_key)
+        worker.signals.fetched.connect(self._on_details_fetched)
+        self._details_worker = worker
+        self._details_on_done = on_done
+        QThreadPool.globalInstance().start(worker)
+        return True
+
+    def _on_details_fetched(self, targets: list[Ticket], details_map: dict[str, dict]) -> None:
+        on_done = self._details_on_done
+        self._details_worker = None
+        self._details_on_done = None
+        self._apply_details(targets, details_map)
+        if on_done is not None:
+            on_done()
+
+    def _apply_details(self, targets: list[Ticket], details_map: dict[str, dict]) -> None:
+        for t in targets:
+            details = details_map.get(t.url)
+            if details is None:
                 continue
             try:
-                details = fetch_issue_details(t.url, api_key)
                 if details.get("due_date"):
+                    if self._sorted_by_due and t.due_date != details["due_date"]:
+                        self._sorted_tickets = None
                     t.due_date = details["due_date"]
                 if details.get("description") is not None:
                     t.description = details["description"]
                 if details.get("custom_fields") is not None:
                     t.custom_fields = details["custom_fields"]
-                terms = _split_terms(t.feed_search)
+                # フィード取得時と同じコンパイル済みパターンで、lower() せずに照合する
+                pattern = _compile_terms(t.feed_search)
                 custom_targets = _split_terms(t.feed_search_custom)
-                if terms and (t.description or t.custom_fields):
-                    desc = (t.description or "").lower()
-                    hit = any(term in desc for term in terms)
+                if pattern is not None and (t.description or t.custom_fields):
+                    hit = bool(pattern.search(t.description or ""))
                     if not hit and custom_targets and t.custom_fields:
                         for name in custom_targets:
-                            val = (t.custom_fields or {}).get(name, "").lower()
-                            if any(term in val for term in terms):
+                            if pattern.search(t.custom_fields.get(name, "")):
                                 hit = True
                                 break
                     t.search_hit = t.search_hit or hit
@@ -310,68 +477,50 @@ class MainWindow(QMainWindow):
                 continue
         self.refresh_table()
 
-    def refresh_table(self) -> None:
-        self.tree.clear()
-        if self.config.get("sort_by_due", False):
-            def sort_key(t: Ticket) -> tuple:
-                due_key = t.due_date or "9999-99-99T99:99:99"
-                return (due_key, t.feed_id, t.ticket_id)
-        else:
-            def sort_key(t: Ticket) -> tuple:
-                return (t.feed_id, t.ticket_id)
+    def schedule_refresh(self) -> None:
+        if not self.refresh_timer.isActive():
+            self.refresh_timer.start()
 
-        items_all = sorted(self.tickets.values(), key=sort_key)
+    def refresh_table(self) -> None:
+        """チケット一覧を表示に反映する。変化のあった行・見出しだけを更新する。"""
+        self.refresh_timer.stop()
+        # 差分の反映中は再描画を止め、最後に1回だけ描画する
+        self.tree.setUpdatesEnabled(False)
+        try:
+            self._apply_table_diff()
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
+    def _apply_table_diff(self) -> None:
+        sort_by_due = bool(self.config.get("sort_by_due", False))
+        # 並び順は済切替では変わらないため、フィードの移動・期日の変更時とソート設定の変更時だけ並べ直す
+        if self._sorted_tickets is None or self._sorted_by_due != sort_by_due:
+            sort_key = _due_order_key if sort_by_due else _FEED_ORDER_KEY
+            self._sorted_tickets = sorted(self.tickets.values(), key=sort_key)
+            self._sorted_by_due = sort_by_due
+        items_all = self._sorted_tickets
+        only_open = self.only_open_chk.isChecked()
 
         pending_counts: dict[str, int] = {}
+        feed_titles_map: dict[str, str] = {}
+        display_groups: dict[str, list[Ticket]] = {}
         for t in items_all:
             key = t.feed_id or "feed"
+            feed_titles_map[key] = t.feed_title or "feed"
             if not t.done:
                 pending_counts[key] = pending_counts.get(key, 0) + 1
+            if not (only_open and t.done):
+                display_groups.setdefault(key, []).append(t)
 
-        display_items = [t for t in items_all if not (self.only_open_chk.isChecked() and t.done)]
-
-        display_groups: dict[str, list[Ticket]] = {}
-        for t in display_items:
-            display_groups.setdefault(t.feed_id or "feed", []).append(t)
-
-        feed_ids = sorted({t.feed_id or "feed" for t in items_all})
-        feed_titles_map = {t.feed_id or "feed": t.feed_title or "feed" for t in items_all}
-        for feed_id in feed_ids:
-            tickets = display_groups.get(feed_id, [])
-            pending = pending_counts.get(feed_id, 0)
-            title = feed_titles_map.get(feed_id, "feed")
-            parent_label = f"{title} (未済 {pending}件)"
-            parent = QTreeWidgetItem(self.tree, [parent_label])
-            parent.setFirstColumnSpanned(True)
-            parent.setExpanded(True)
-            for t in tickets:
-                child = QTreeWidgetItem(
-                    [
-                        t.ticket_id,
-                        "",  # 開くボタン
-                        "済" if t.done else "",
-                        "",  # 済ボタン
-                        "○" if t.search_hit else "",
-                        t.updated_on,
-                        t.done_at or "",
-                        t.due_date,
-                        t.subject,
-                    ]
-                )
-                child.setData(0, Qt.UserRole, t.ticket_id)
-                for col in (COLUMNS.IDX_ID, COLUMNS.IDX_DONE, COLUMNS.IDX_SEARCH_HIT):
-                    child.setTextAlignment(col, Qt.AlignCenter)
-                parent.addChild(child)
-
-                open_btn = QPushButton("開く")
-                open_btn.clicked.connect(lambda _, tid=t.ticket_id: self.open_ticket(tid))
-                self.tree.setItemWidget(child, COLUMNS.IDX_OPEN, open_btn)
-
-                done_btn = QPushButton("済切替")
-                done_btn.clicked.connect(lambda _, tid=t.ticket_id: self.toggle_done_one(tid))
-                self.tree.setItemWidget(child, COLUMNS.IDX_TOGGLE, done_btn)
-
-        self.update_column_visibility()
+        groups = [
+            (feed_id, f"{feed_titles_map[feed_id]} (未済 {pending_counts.get(feed_id, 0)}件)", display_groups.get(feed_id, []))
+            for feed_id in sorted(feed_titles_map)
+        ]
+        # 新しく現れた見出しは全列をまたいで表示し、展開しておく
+        for feed_id in self.ticket_model.set_groups(groups):
+            idx = self.ticket_model.feed_index(feed_id)
+            self.tree.setFirstColumnSpanned(idx.row(), QModelIndex(), True)
+            self.tree.expand(idx)
 
     def toggle_done_one(self, ticket_id: str) -> None:
         t = self.tickets.get(ticket_id)
@@ -380,18 +529,18 @@ class MainWindow(QMainWindow):
         now = datetime.now().isoformat(timespec="seconds")
         t.done = not t.done
         t.done_at = now if t.done else None
-        save_csv(self.tickets)
-        self.refresh_table()
+        self.record_done([t])
+        self.schedule_refresh()
 
     def toggle_selected(self) -> None:
-        selected = self.tree.selectedItems()
+        selected = self.tree.selectionModel().selectedRows()
         if not selected:
             QMessageBox.information(self, "未選択", "切り替えるチケットを選択してください。")
             return
         now = datetime.now().isoformat(timespec="seconds")
-        changed = 0
-        for item in selected:
-            ticket_id = item.data(0, Qt.UserRole)
+        changed: list[Ticket] = []
+        for index in selected:
+            ticket_id = index.data(Qt.UserRole)
             if not ticket_id:
                 continue
             t = self.tickets.get(ticket_id)
@@ -399,10 +548,10 @@ class MainWindow(QMainWindow):
                 continue
             t.done = not t.done
             t.done_at = now if t.done else None
-            changed += 1
+            changed.append(t)
         if changed:
-            save_csv(self.tickets)
-            self.refresh_table()
+            self.record_done(changed)
+            self.schedule_refresh()
 
     def set_done(self, ticket_id: str) -> None:
         t = self.tickets.get(ticket_id)
@@ -414,11 +563,56 @@ class MainWindow(QMainWindow):
         now = datetime.now().isoformat(timespec="seconds")
         t.done = True
         t.done_at = now
-        save_csv(self.tickets)
-        self.refresh_table()
+        self.record_done([t])
+        self.schedule_refresh()
+
+    def record_done(self, tickets: list[Ticket]) -> None:
+        append_journal(tickets)
+        self._journal_pending = True
+
+    def flush_save(self) -> None:
+        # 書き出す内容に含まれるフィードの検証子も一緒に渡し、書き終えてから保存する
+        token = (journal_generation(), dict(self._unsaved_validators))
+        if self.csv_writer.isRunning():
+            self._save_token = token
+            self.csv_writer.request_save(ticket_rows(self.tickets), token)
+        else:
+            save_csv(self.tickets)
+            self._on_csv_saved(token)
+        self._journal_pending = False
+
+    def _on_csv_saved(self, token: tuple[int, dict]) -> None:
+        if token is self._save_token:
+            self._save_token = None
+        generation, validators = token
+        clear_journal(generation)
+        self._commit_validators(validators)
+
+    def _commit_validators(self, validators: dict) -> None:
+        for url, entry in validators.items():
+            # 後の同期で新しい検証子に置き換わっていれば、そちらは次の書き出しまで残す
+            if self._unsaved_validators.get(url) is entry:
+                del self._unsaved_validators[url]
+        commit_feed_validators(validators)
+        save_feed_cache()
+
+    def _on_csv_failed(self, token: tuple[int, dict], error: Exception) -> None:
+        if token is self._save_token:
+            self._save_token = None
+        self._journal_pending = True
+        QMessageBox.critical(self, "保存失敗", f"tickets.csv を保存できませんでした。\n{error}")
+
+    def closeEvent(self, event) -> None:
+        # 書き出し中の内容を書き終えてから、残りがあればこのスレッドで保存する
+        self.csv_writer.stop()
+        # 書き出し完了の通知はもう届かないため、検証子が残っていれば保存し直してから反映する
+        if self._journal_pending or self._unsaved_validators:
+            save_csv(self.tickets)
+            self._commit_validators(dict(self._unsaved_validators))
+        super().closeEvent(event)
 
-    def handle_item_double_clicked(self, item: QTreeWidgetItem, _: int) -> None:
-        ticket_id = item.data(0, Qt.UserRole)
+    def handle_index_double_clicked(self, index: QModelIndex) -> None:
+        ticket_id = index.siblingAtColumn(0).data(Qt.UserRole)
         if not ticket_id:
             return
         t = self.tickets.get(ticket_id)
@@ -457,8 +651,19 @@ class MainWindow(QMainWindow):
         if not pending_ids:
             QMessageBox.information(self, "対象なし", "未済のチケットがありません。")
             return
-        self._update_details(pending_ids, api_key)
-        save_csv(self.tickets)
+        if self._fetch_workers or self._details_worker is not None:
+            QMessageBox.information(self, "同期中", "同期が終わってから再取得してください。")
+            return
+        self.refetch_pending_btn.setEnabled(False)
+        if not self._start_details(pending_ids, api_key, self._on_refetch_done):
+            self._on_refetch_done()
+
+    def _on_refetch_done(self) -> None:
+        self.refetch_pending_btn.setEnabled(bool(self.config.get("enable_api_details", False)))
+        self.flush_save()
+        # 再取得中に予定時刻を過ぎた同期は見送られているので、ここで改めて行う
+        if self.sync_running and not self.sync_timer.isActive():
+            self.schedule_sync(0)
         QMessageBox.information(self, "再取得完了", "未済チケットの追加情報を再取得しました。")
 
     def apply_config_settings(self) -> None:
@@ -469,6 +674,7 @@ class MainWindow(QMainWindow):
         # ボタン有効/無効切替（API取得設定に追従）
         self.refetch_pending_btn.setEnabled(bool(self.config.get("enable_api_details", False)))
 
+        self.update_column_visibility()
         self.refresh_table()
 
     def open_ticket(self, ticket_id: str) -> None:
@@ -1,11 +1,23 @@
 import re
+import sys
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from constants import ATOM_NS
+from constants import ATOM_CATEGORY, ATOM_ID, ATOM_TITLE, ATOM_UPDATED
 
+_TICKET_ID_RE = re.compile(r"#(\d+)")
 
-@dataclass
+
+@dataclass(slots=True)
+class Feed:
+    id: str
+    title: str
+    url: str
+    search: str = ""
+    search_custom: str = ""
+
+
+@dataclass(slots=True)
 class Ticket:
     ticket_id: str
     subject: str
@@ -22,18 +34,25 @@ class Ticket:
     search_hit: bool = False
     done: bool = False
     done_at: str | None = None
+    # 並べ替え用の数値ID（数字でないIDは -1）
+    _id_int: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.ticket_id.isdigit():
+            self._id_int = int(self.ticket_id)
 
     @classmethod
     def from_entry(
         cls, entry: ET.Element, feed_id: str, feed_title: str, feed_search: str, search_hit: bool
     ) -> "Ticket":
-        raw_title = (entry.findtext("atom:title", default="", namespaces=ATOM_NS) or "").strip()
-        updated = (entry.findtext("atom:updated", default="", namespaces=ATOM_NS) or "").strip()
-        entry_id = entry.findtext("atom:id", default="", namespaces=ATOM_NS) or ""
-        category = entry.find("atom:category", ATOM_NS)
-        status = category.get("term") if category is not None and category.get("term") else "unknown"
+        raw_title = (entry.findtext(ATOM_TITLE) or "").strip()
+        updated = (entry.findtext(ATOM_UPDATED) or "").strip()
+        entry_id = entry.findtext(ATOM_ID) or ""
+        category = entry.find(ATOM_CATEGORY)
+        # ステータスやIDは全チケットで同じ文字列が繰り返されるため intern して共有する
+        status = sys.intern((category.get("term") if category is not None else None) or "unknown")
         url = entry_id  # Redmineのatom:idはチケットURLが入るケースが多い
-        ticket_id = extract_ticket_id(entry, raw_title)
+        ticket_id = sys.intern(_ticket_id_from(entry_id, raw_title))
         subject = extract_subject(raw_title)
         return cls(
             ticket_id=ticket_id,
@@ -48,10 +67,9 @@ class Ticket:
         )
 
 
-def extract_ticket_id(entry: ET.Element, title_text: str) -> str:
-    entry_id = entry.findtext("atom:id", default="", namespaces=ATOM_NS) or ""
+def _ticket_id_from(entry_id: str, title_text: str) -> str:
     for candidate in (entry_id, title_text):
-        match = re.search(r"#(\d+)", candidate)
+        match = _TICKET_ID_RE.search(candidate)
         if match:
             return match.group(1)
     return entry_id or title_text or "unknown"
@@ -59,6 +77,5 @@ def extract_ticket_id(entry: ET.Element, title_text: str) -> str:
 
 def extract_subject(title_text: str) -> str:
     # Redmine Atom のタイトルは "Project - Tracker #1234: Subject" 形式が多い
-    if ": " in title_text:
-        return title_text.split(": ", 1)[1]
-    return title_text
+    _, sep, subject = title_text.partition(": ")
+    return subject if sep else title_text
@@ -1,13 +1,23 @@
 import csv
 import os
 import json
+import sys
+from datetime import datetime
+from typing import IO, Iterable
 
-from constants import DATA_PATH
+from constants import DATA_PATH, JOURNAL_PATH
 from models import Ticket
 
+# 済切替の追記先（tickets.csv を書き直すまで開いたままにする）
+_journal_file: IO[str] | None = None
+_journal_writer = None
+# 追記のたびに増える。書き出した tickets.csv がどこまでの追記を含むかの判定に使う
+_journal_generation = 0
+
 
 def self_safe_load(value: str | None) -> dict:
-    if not value:
+    # 追加情報のないチケットは "{}" なので、JSONとして解析しない
+    if not value or value == "{}":
         return {}
     try:
         return json.loads(value)
@@ -15,71 +25,158 @@ def self_safe_load(value: str | None) -> dict:
         return {}
 
 
+_FIELDNAMES = (
+    "ticket_id",
+    "subject",
+    "status",
+    "updated_on",
+    "due_date",
+    "description",
+    "custom_fields",
+    "url",
+    "feed_id",
+    "feed_title",
+    "feed_search",
+    "feed_search_custom",
+    "search_hit",
+    "done",
+    "done_at",
+)
+
+
 def load_csv() -> dict[str, Ticket]:
-    if not os.path.exists(DATA_PATH):
+    try:
+        f = open(DATA_PATH, newline="", encoding="utf-8")
+    except FileNotFoundError:
         return {}
     tickets: dict[str, Ticket] = {}
-    with open(DATA_PATH, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    with f:
+        # DictReader は行ごとに dict を作るため、ヘッダーから列位置を引いて直接取り出す
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return {}
+        width = len(header)
+        # ヘッダーにない列は行末に足した空欄を指す
+        (
+            i_ticket_id, i_subject, i_status, i_updated_on, i_due_date, i_description, i_custom_fields, i_url,
+            i_feed_id, i_feed_title, i_feed_search, i_feed_search_custom, i_search_hit, i_done, i_done_at,
+        ) = (header.index(name) if name in header else width for name in _FIELDNAMES)
+        intern = sys.intern
         for row in reader:
-            tickets[row["ticket_id"]] = Ticket(
-                ticket_id=row["ticket_id"],
-                subject=row["subject"],
-                status=row["status"],
-                updated_on=row["updated_on"],
-                due_date=row.get("due_date", ""),
-                description=row.get("description", ""),
-                custom_fields=self_safe_load(row.get("custom_fields")),
-                feed_id=row.get("feed_id", ""),
-                feed_title=row.get("feed_title", ""),
-                feed_search=row.get("feed_search", ""),
-                feed_search_custom=row.get("feed_search_custom", ""),
-                url=row.get("url", ""),
-                search_hit=row.get("search_hit", "False") == "True",
-                done=row.get("done", "False") == "True",
-                done_at=row.get("done_at") or None,
+            if not row:
+                continue
+            row += [""] * (width + 1 - len(row))
+            tickets[row[i_ticket_id]] = Ticket(
+                ticket_id=row[i_ticket_id],
+                subject=row[i_subject],
+                status=intern(row[i_status]),
+                updated_on=row[i_updated_on],
+                due_date=row[i_due_date],
+                description=row[i_description],
+                custom_fields=self_safe_load(row[i_custom_fields]),
+                feed_id=intern(row[i_feed_id]),
+                feed_title=intern(row[i_feed_title]),
+                feed_search=intern(row[i_feed_search]),
+                feed_search_custom=intern(row[i_feed_search_custom]),
+                url=row[i_url],
+                search_hit=row[i_search_hit] == "True",
+                done=row[i_done] == "True",
+                done_at=row[i_done_at] or None,
             )
+    _replay_journal(tickets)
     return tickets
 
 
-def save_csv(tickets: dict[str, Ticket]) -> None:
-    fieldnames = [
-        "ticket_id",
-        "subject",
-        "status",
-        "updated_on",
-        "due_date",
-        "description",
-        "custom_fields",
-        "url",
-        "feed_id",
-        "feed_title",
-        "feed_search",
-        "feed_search_custom",
-        "search_hit",
-        "done",
-        "done_at",
+def _replay_journal(tickets: dict[str, Ticket]) -> None:
+    try:
+        f = open(JOURNAL_PATH, newline="", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        # 各行は切替後の状態そのものなので、先頭から順に当て直せばよい
+        for row in csv.reader(f):
+            if len(row) < 3:
+                continue
+            t = tickets.get(row[0])
+            if t is not None:
+                t.done = row[1] == "True"
+                t.done_at = row[2] or None
+
+
+def append_journal(tickets: Iterable[Ticket]) -> None:
+    """済状態の変更を tickets.journal.csv に追記する。tickets.csv は書き直さない。"""
+    global _journal_file, _journal_writer, _journal_generation
+    _journal_generation += 1
+    if _journal_file is None:
+        _journal_file = open(JOURNAL_PATH, "a", newline="", encoding="utf-8")
+        _journal_writer = csv.writer(_journal_file)
+    now = datetime.now().isoformat(timespec="seconds")
+    _journal_writer.writerows((t.ticket_id, "True" if t.done else "False", t.done_at or "", now) for t in tickets)
+    _journal_file.flush()
+
+
+def journal_generation() -> int:
+    return _journal_generation
+
+
+def clear_journal(generation: int) -> None:
+    """generation 時点の内容で tickets.csv を書き出した後に呼ぶ。その後の追記があれば残す。"""
+    if generation == _journal_generation:
+        _clear_journal()
+
+
+def _clear_journal() -> None:
+    global _journal_file, _journal_writer
+    if _journal_file is not None:
+        _journal_file.close()
+        _journal_file = None
+        _journal_writer = None
+    try:
+        os.remove(JOURNAL_PATH)
+    except FileNotFoundError:
+        pass
+
+
+def ticket_rows(tickets: dict[str, Ticket]) -> list[tuple[str, ...]]:
+    """tickets.csv に書く行を作る。別スレッドで書き出す場合も呼び出し側で作っておく。"""
+    return [
+        (
+            t.ticket_id,
+            t.subject,
+            t.status,
+            t.updated_on,
+            t.due_date,
+            t.description,
+            json.dumps(t.custom_fields, ensure_ascii=False) if t.custom_fields else "{}",
+            t.url,
+            t.feed_id,
+            t.feed_title,
+            t.feed_search,
+            t.feed_search_custom,
+            "True" if t.search_hit else "False",
+            "True" if t.done else "False",
+            t.done_at or "",
+        )
+        for t in tickets.values()
     ]
-    with open(DATA_PATH, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for t in tickets.values():
-            writer.writerow(
-                {
-                    "ticket_id": t.ticket_id,
-                    "subject": t.subject,
-                    "status": t.status,
-                    "updated_on": t.updated_on,
-                    "due_date": t.due_date,
-                    "description": t.description,
-                    "custom_fields": json.dumps(t.custom_fields or {}, ensure_ascii=False),
-                    "url": t.url,
-                    "feed_id": t.feed_id,
-                    "feed_title": t.feed_title,
-                    "feed_search": t.feed_search,
-                    "feed_search_custom": t.feed_search_custom,
-                    "search_hit": str(t.search_hit),
-                    "done": str(t.done),
-                    "done_at": t.done_at or "",
-                }
-            )
+
+
+# tickets.csv は一度に書き出すため、書き込みバッファを大きめに取る
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+def write_rows(rows: Iterable[tuple[str, ...]]) -> None:
+    # 一時ファイルに書いてから差し替え、書き込み途中で落ちても tickets.csv を壊さない
+    tmp_path = DATA_PATH + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(_FIELDNAMES)
+        writer.writerows(rows)
+    os.replace(tmp_path, DATA_PATH)
+
+
+def save_csv(tickets: dict[str, Ticket]) -> None:
+    write_rows(ticket_rows(tickets))
+    # 追記分は書き出した tickets.csv に含まれるので捨てる
+    _clear_journal()
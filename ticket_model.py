@@ -0,0 +1,155 @@
+import operator
+from typing import Callable
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from models import Ticket
+from ui_columns import COLUMNS
+
+# 見出し行の 0 列目に持たせるフィードID
+FEED_ID_ROLE = Qt.UserRole + 1
+
+_CENTERED_COLUMNS = frozenset((COLUMNS.IDX_ID, COLUMNS.IDX_DONE, COLUMNS.IDX_SEARCH_HIT))
+
+
+# 列ごとの表示文字列。表示中のセルを描画するときにだけ作る
+_COLUMN_TEXT: tuple[Callable[[Ticket], str], ...] = (
+    operator.attrgetter("ticket_id"),
+    lambda t: "",  # 開くボタン
+    lambda t: "済" if t.done else "",
+    lambda t: "",  # 済ボタン
+    lambda t: "○" if t.search_hit else "",
+    operator.attrgetter("updated_on"),
+    lambda t: t.done_at or "",
+    operator.attrgetter("due_date"),
+    operator.attrgetter("subject"),
+)
+
+
+class TicketTreeModel(QAbstractItemModel):
+    """フィードごとの見出し行と、その下のチケット行を持つ2階層のモデル。
+
+    ビューが表示する範囲のセルだけを data() で都度返すため、行ごとのアイテムを作らない。
+    見出し行の internalId は 0、チケット行は (見出し行の行番号 + 1)。
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._feed_ids: list[str] = []
+        self._labels: list[str] = []
+        self._rows: list[list[Ticket]] = []
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid():
+            if parent.internalId() != 0 or not 0 <= row < len(self._rows[parent.row()]):
+                return QModelIndex()
+            return self.createIndex(row, column, parent.row() + 1)
+        if not 0 <= row < len(self._feed_ids):
+            return QModelIndex()
+        return self.createIndex(row, column, 0)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self._feed_ids)
+        if parent.internalId() == 0 and parent.column() == 0:
+            return len(self._rows[parent.row()])
+        return 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(COLUMNS.labels)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        group = index.internalId()
+        col = index.column()
+        if group == 0:
+            if col != 0:
+                return None
+            if role == Qt.DisplayRole:
+                return self._labels[index.row()]
+            if role == FEED_ID_ROLE:
+                return self._feed_ids[index.row()]
+            return None
+        t = self._rows[group - 1][index.row()]
+        if role == Qt.DisplayRole:
+            return _COLUMN_TEXT[col](t)
+        if role == Qt.UserRole:
+            return t.ticket_id if col == 0 else None
+        if role == Qt.TextAlignmentRole and col in _CENTERED_COLUMNS:
+            return Qt.AlignCenter
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS.labels[section]
+        return super().headerData(section, orientation, role)
+
+    def feed_index(self, feed_id: str) -> QModelIndex:
+        try:
+            return self.index(self._feed_ids.index(feed_id), 0)
+        except ValueError:
+            return QModelIndex()
+
+    def set_groups(self, groups: list[tuple[str, str, list[Ticket]]]) -> list[str]:
+        """(フィードID, 見出し, チケット一覧) の並びを表示内容にする。
+
+        並びが前回と同じならフィードごとに dataChanged を出す。並びが変わったときは
+        layoutChanged で組み替え、選択・展開状態はIDで引き継ぐ。戻り値は新しく現れたフィードID。
+        """
+        feed_ids = [g[0] for g in groups]
+        labels = [g[1] for g in groups]
+        rows = [g[2] for g in groups]
+        same_layout = feed_ids == self._feed_ids and all(
+            len(new) == len(old) and all(a is b for a, b in zip(new, old)) for new, old in zip(rows, self._rows)
+        )
+        if same_layout:
+            # セルの値は data() で都度作るため、フィードごとに範囲を通知するだけでよい（再描画は表示範囲のみ）
+            prev_labels = self._labels
+            self._labels = labels
+            last_col = len(COLUMNS.labels) - 1
+            for g, label in enumerate(labels):
+                if label != prev_labels[g]:
+                    idx = self.index(g, 0)
+                    self.dataChanged.emit(idx, idx, [Qt.DisplayRole])
+                if rows[g]:
+                    self.dataChanged.emit(
+                        self.createIndex(0, 0, g + 1), self.createIndex(len(rows[g]) - 1, last_col, g + 1), [Qt.DisplayRole]
+                    )
+            return []
+
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_keys = [self._key(idx) for idx in old_indexes]
+        known = set(self._feed_ids)
+        added = [fid for fid in feed_ids if fid not in known]
+        self._feed_ids, self._labels, self._rows = feed_ids, labels, rows
+        feed_pos = {fid: g for g, fid in enumerate(feed_ids)}
+        ticket_pos = {t.ticket_id: (g, r) for g, tickets in enumerate(rows) for r, t in enumerate(tickets)}
+        new_indexes = []
+        for idx, key in zip(old_indexes, old_keys):
+            new_idx = QModelIndex()
+            if key is not None:
+                kind, key_id = key
+                if kind == "feed" and key_id in feed_pos:
+                    new_idx = self.createIndex(feed_pos[key_id], idx.column(), 0)
+                elif kind == "ticket" and key_id in ticket_pos:
+                    g, r = ticket_pos[key_id]
+                    new_idx = self.createIndex(r, idx.column(), g + 1)
+            new_indexes.append(new_idx)
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+        return added
+
+    def _key(self, index: QModelIndex) -> tuple[str, str] | None:
+        if not index.isValid():
+            return None
+        group = index.internalId()
+        if group == 0:
+            return ("feed", self._feed_ids[index.row()])
+        return ("ticket", self._rows[group - 1][index.row()].ticket_id)
@@ -0,0 +1,109 @@
+from PySide6.QtCore import QMutex, QMutexLocker, QObject, QRunnable, QThread, QWaitCondition, Signal
+
+from feed_client import fetch_feed, fetch_issues_details
+from models import Feed, Ticket
+from storage import write_rows
+
+
+class FeedFetchSignals(QObject):
+    # (feed, tickets)。変化なしのフィードは tickets が None
+    fetched = Signal(object, object)
+    # (feed, 例外)
+    failed = Signal(object, object)
+
+
+class FeedFetchWorker(QRunnable):
+    """1フィードを取得・解析する。結果はシグナル経由でUIスレッドに届く。"""
+
+    def __init__(self, feed: Feed, api_key: str) -> None:
+        super().__init__()
+        self.feed = feed
+        self.api_key = api_key
+        # UIスレッドで生成するため、接続先へはキュー経由で配送される
+        self.signals = FeedFetchSignals()
+
+    def run(self) -> None:
+        feed = self.feed
+        try:
+            tickets = fetch_feed(feed.url, self.api_key, feed.id, feed.title, feed.search, feed.search_custom)
+        except Exception as e:  # noqa: BLE001
+            self.signals.failed.emit(feed, e)
+            return
+        self.signals.fetched.emit(feed, tickets)
+
+
+class DetailsFetchSignals(QObject):
+    # (対象チケット, チケットURL -> 追加情報)
+    fetched = Signal(object, object)
+
+
+class DetailsFetchWorker(QRunnable):
+    """チケットの追加情報をAPIでまとめて取得する。
+
+    取得に失敗した場合は空の結果を渡す（追加情報なしのまま続ける）。
+    """
+
+    def __init__(self, targets: list[Ticket], api_key: str) -> None:
+        super().__init__()
+        self.targets = targets
+        # URLはUIスレッドで取り出しておき、ワーカーからはチケットに触れない
+        self.urls = [t.url for t in targets]
+        self.api_key = api_key
+        self.signals = DetailsFetchSignals()
+
+    def run(self) -> None:
+        try:
+            details_map = fetch_issues_details(self.urls, self.api_key)
+        except Exception:  # noqa: BLE001
+            details_map = {}
+        self.signals.fetched.emit(self.targets, details_map)
+
+
+class CsvWriter(QThread):
+    """tickets.csv の書き出し専用スレッド。
+
+    未処理の依頼は1件だけ保持し、新しい依頼で上書きする（最新の内容だけを書けばよい）。
+    """
+
+    # 書き出した依頼の request_save に渡した token
+    saved = Signal(object)
+    # (token, 例外)
+    failed = Signal(object, object)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._mutex = QMutex()
+        self._cond = QWaitCondition()
+        self._pending: tuple[list[tuple[str, ...]], object] | None = None
+        self._stopping = False
+
+    def request_save(self, rows: list[tuple[str, ...]], token: object) -> None:
+        """rows の書き出しを依頼する。書き終えたら token を saved で返す。"""
+        with QMutexLocker(self._mutex):
+            self._pending = (rows, token)
+            self._cond.wakeOne()
+
+    def stop(self) -> None:
+        """未処理の依頼を書き終えてからスレッドを終了する。"""
+        with QMutexLocker(self._mutex):
+            self._stopping = True
+            self._cond.wakeOne()
+        self.wait()
+
+    def run(self) -> None:
+        while True:
+            with QMutexLocker(self._mutex):
+                while self._pending is None and not self._stopping:
+                    self._cond.wait(self._mutex)
+                job, self._pending = self._pending, None
+                stopping = self._stopping
+            if job is not None:
+                rows, token = job
+                try:
+                    write_rows(rows)
+                except Exception as e:  # noqa: BLE001
+                    self.failed.emit(token, e)
+                else:
+                    self.saved.emit(token)
+            if stopping:
+                return